@@ -5,44 +5,20 @@ except those referenced in the input.json file where key="location".
 This version creates a shell script for review before execution.
 """
 
-import json
 import os
+import shlex
 import sys
-from pathlib import Path
+
+from traverse import extract_entries, find_files_to_delete
 
 def extract_location_files(json_file_path):
     """
-    Extract all file paths from JSON where key is "location"
+    Extract all file paths from JSON where key is "location". Returns
+    the raw location set for reporting plus normalized keep-path and
+    keep-name sets built during the same pass.
     """
-    try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error reading JSON file: {e}")
-        return set()
-    
-    location_files = set()
-    
-    def traverse_json(obj):
-        """Recursively traverse JSON to find location entries"""
-        if isinstance(obj, dict):
-            # Check if this is a location entry
-            if obj.get("key") == "location" and "value" in obj:
-                file_path = obj["value"]
-                if isinstance(file_path, str) and file_path.strip():
-                    location_files.add(file_path)
-            
-            # Recursively check all values in the dict
-            for value in obj.values():
-                traverse_json(value)
-                
-        elif isinstance(obj, list):
-            # Recursively check all items in the list
-            for item in obj:
-                traverse_json(item)
-    
-    traverse_json(data)
-    return location_files
+    location_files, _, _, keep_paths, keep_names = extract_entries(json_file_path)
+    return location_files, keep_paths, keep_names
 
 def get_protected_files():
     """
@@ -52,6 +28,8 @@ def get_protected_files():
         'input.json',
         'cleanup_files.py',
         'generate_cleanup_script.py',
+        'traverse.py',
+        'test_traverse.py',
         'cleanup_script.sh',
         'poc.json',
         '.git',
@@ -62,66 +40,17 @@ def get_protected_files():
         'mvnw.cmd'
     }
 
-def normalize_path(file_path):
-    """
-    Normalize file path to handle different path formats
-    """
-    if file_path.startswith('./'):
-        file_path = file_path[2:]
-    return Path(file_path)
-
-def find_files_to_delete(location_files, protected_files):
-    """
-    Find all files in current directory that should be deleted
-    """
-    current_dir = Path('.')
-    all_files = set()
-    
-    # Get all files recursively
-    for item in current_dir.rglob('*'):
-        if item.is_file():
-            rel_path = str(item.relative_to(current_dir))
-            all_files.add(rel_path)
-    
-    # Normalize location files for comparison
-    normalized_location_files = set()
-    for loc_file in location_files:
-        normalized_path = normalize_path(loc_file)
-        normalized_location_files.add(str(normalized_path))
-        
-        # Also add the filename only
-        filename_only = normalized_path.name
-        if filename_only:
-            normalized_location_files.add(filename_only)
-    
-    # Files to keep
-    files_to_keep = protected_files.union(normalized_location_files)
-    
-    # Find files to delete
-    files_to_delete = []
-    for file_path in all_files:
-        path_obj = Path(file_path)
-        should_keep = False
-        
-        for keep_file in files_to_keep:
-            keep_path = Path(keep_file)
-            
-            if (str(path_obj) == str(keep_path) or 
-                path_obj.name == keep_path.name or 
-                str(path_obj).startswith('.git/')):
-                should_keep = True
-                break
-        
-        if not should_keep:
-            files_to_delete.append(file_path)
-    
-    return files_to_delete, files_to_keep
-
 def generate_shell_script(files_to_delete, files_to_keep):
     """
     Generate a shell script to delete the specified files
     """
-    script_content = f"""#!/bin/bash
+    # Build the script in a list and join once at the end; repeated
+    # str += is quadratic in the output length
+    buf = []
+    append = buf.append
+    sorted_deletes = sorted(files_to_delete)
+
+    append(f"""#!/bin/bash
 
 # Generated cleanup script
 # This script will delete files not referenced in input.json location fields
@@ -133,19 +62,19 @@ echo ""
 
 # Files that will be kept (for reference):
 echo "📂 Files that will be KEPT:"
-"""
+""")
 
     # Add kept files as comments
     for file_path in sorted(files_to_keep):
-        script_content += f'echo "   • {file_path}"\n'
-    
-    script_content += '\necho ""\necho "🗑️  Files that will be DELETED:"\n'
-    
+        append(f'echo "   • {file_path}"\n')
+
+    append('\necho ""\necho "🗑️  Files that will be DELETED:"\n')
+
     # Add files to delete as comments first
-    for file_path in sorted(files_to_delete):
-        script_content += f'echo "   • {file_path}"\n'
-    
-    script_content += f'''
+    for file_path in sorted_deletes:
+        append(f'echo "   • {file_path}"\n')
+
+    append(f'''
 echo ""
 read -p "⚠️  Are you sure you want to delete {len(files_to_delete)} files? (yes/no): " confirm
 
@@ -153,15 +82,14 @@ if [[ $confirm == "yes" || $confirm == "y" ]]; then
     echo "🗑️  Starting deletion..."
     deleted_count=0
     error_count=0
-    
-'''
-    
+
+''')
+
     # Add deletion commands
-    for file_path in sorted(files_to_delete):
-        # Escape special characters for shell
-        escaped_path = file_path.replace("'", "'\"'\"'")
-        script_content += f"""    if [ -f '{escaped_path}' ]; then
-        if rm '{escaped_path}'; then
+    for file_path in sorted_deletes:
+        quoted_path = shlex.quote(file_path)
+        append(f"""    if [ -f {quoted_path} ]; then
+        if rm {quoted_path}; then
             echo "✅ Deleted: {file_path}"
             ((deleted_count++))
         else
@@ -171,10 +99,10 @@ if [[ $confirm == "yes" || $confirm == "y" ]]; then
     else
         echo "⚠️  File not found: {file_path}"
     fi
-    
-"""
-    
-    script_content += f'''    echo ""
+
+""")
+
+    append(f'''    echo ""
     echo "📊 Summary:"
     echo "   • Successfully deleted: $deleted_count files"
     echo "   • Errors: $error_count files"
@@ -182,9 +110,9 @@ if [[ $confirm == "yes" || $confirm == "y" ]]; then
 else
     echo "🚫 Operation cancelled."
 fi
-'''
-    
-    return script_content
+''')
+
+    return ''.join(buf)
 
 def main():
     """
@@ -193,7 +121,7 @@ def main():
     print("🔍 Analyzing input.json for file locations...")
     
     # Extract location files from JSON
-    location_files = extract_location_files('input.json')
+    location_files, keep_paths, keep_names = extract_location_files('input.json')
     
     if not location_files:
         print("❌ No location files found in input.json")
@@ -211,7 +139,7 @@ def main():
         print(f"   • {prot_file}")
     
     # Find files to delete
-    files_to_delete, files_to_keep = find_files_to_delete(location_files, protected_files)
+    files_to_delete, files_to_keep = find_files_to_delete(keep_paths, keep_names, protected_files)
     
     print(f"\n📂 Total files to keep: {len(files_to_keep)}")
     print(f"🗑️  Files that would be deleted: {len(files_to_delete)}")
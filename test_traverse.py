@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Regression tests for traverse.extract_entries: SARIF-shaped documents
+must never traceback, and the streaming and full-load paths must agree
+on what gets collected.
+"""
+
+import json
+import os
+import tempfile
+
+from traverse import extract_entries
+
+# Valid JSON that merely resembles SARIF; each of these used to crash
+# the full-load fast path with AttributeError
+CRASH_SHAPES = [
+    {"version": "1.0", "runs": "x"},
+    {"$schema": "s", "runs": {"a": 1}},
+    {"version": "1.0", "runs": [None, "y"]},
+    {"version": "1.0", "runs": [{"results": {"locations": []}}]},
+    {"version": "1.0",
+     "runs": [{"results": [{"locations": [{"physicalLocation": "p"}]}]}]},
+]
+
+def _extract(doc, **kwargs):
+    fd, path = tempfile.mkstemp(suffix='.json')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(doc, f)
+        return extract_entries(path, **kwargs)
+    finally:
+        os.unlink(path)
+
+def test_crash_shapes_do_not_raise():
+    for doc in CRASH_SHAPES:
+        location_files, _, _, keep_paths, keep_names = _extract(
+            doc, include_filenames=True, include_file_fields=True)
+        assert location_files == set()
+        assert keep_paths == set()
+        assert keep_names == set()
+
+def test_pointer_shape_collected_without_schema_keys():
+    # No top-level $schema/version: the pointer shape alone must match,
+    # the same way the streaming prefix match does
+    doc = {"runs": [{"results": [{"locations": [
+        {"physicalLocation": {"artifactLocation": {"uri": "only-stream.txt"}}}]}]}]}
+    location_files, _, _, keep_paths, _ = _extract(doc)
+    assert location_files == {"only-stream.txt"}
+    assert "only-stream.txt" in keep_paths
+
+def test_generic_entries_collected_alongside_sarif():
+    # key/value and "file" entries outside the SARIF pointer must still
+    # be honored on SARIF documents
+    doc = {
+        "$schema": "s", "version": "2.1.0",
+        "runs": [{"results": [{"locations": [
+            {"physicalLocation": {"artifactLocation": {"uri": "src/Main.java"}}}]}]}],
+        "properties": [{"key": "location", "value": "notes/loc.txt"},
+                       {"key": "filename", "value": "extra.txt"},
+                       {"file": "extra/prop.txt"}],
+    }
+    location_files, filename_files, file_field_files, keep_paths, _ = _extract(
+        doc, include_filenames=True, include_file_fields=True)
+    assert location_files == {"src/Main.java", "notes/loc.txt"}
+    assert filename_files == {"extra.txt"}
+    assert file_field_files == {"extra/prop.txt"}
+    assert {"src/Main.java", "notes/loc.txt", "extra/prop.txt"} <= keep_paths
+
+if __name__ == "__main__":
+    test_crash_shapes_do_not_raise()
+    test_pointer_shape_collected_without_schema_keys()
+    test_generic_entries_collected_alongside_sarif()
+    print("ok")
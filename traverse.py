@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the cleanup scripts. JSON extraction walks a
+document once (streaming via ijson when available, SARIF fast path
+when the schema matches, iterative worklist otherwise) and collects
+referenced file paths plus pre-normalized keep sets in the same pass;
+the filesystem side provides the pruning scandir walk and the keep-set
+filter that turns those sets into a deletion list.
+"""
+
+import functools
+import json
+import mmap
+import os
+from collections import deque
+
+try:
+    import ijson
+except ImportError:
+    # ijson is optional; without it we fall back to a full load
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; without it json.load does the full parse
+    orjson = None
+
+# JSON pointer (in ijson prefix form) of SARIF result locations
+_SARIF_URI_PREFIX = 'runs.item.results.item.locations.item.physicalLocation.artifactLocation'
+
+@functools.lru_cache(maxsize=None)
+def normalize_path(file_path):
+    """
+    Normalize a path string, stripping any leading './', and return a
+    (full path, basename) pair; memoized since inputs repeat heavily
+    across location entries
+    """
+    full = file_path[2:] if file_path.startswith('./') else file_path
+    return full, full.rpartition('/')[2]
+
+def _harvest_sarif_locations(data, location_files, keep_paths, keep_names):
+    """
+    Collect runs[*].results[*].locations[*].physicalLocation
+    .artifactLocation.uri entries. Every level is type-checked, so
+    arbitrary valid JSON that merely resembles SARIF (runs as a string,
+    results as a dict, ...) is skipped instead of raising
+    """
+    runs = data.get('runs') if type(data) is dict else None
+    if type(runs) is not list:
+        return
+    for run in runs:
+        if type(run) is not dict:
+            continue
+        results = run.get('results')
+        if type(results) is not list:
+            continue
+        for result in results:
+            if type(result) is not dict:
+                continue
+            locations = result.get('locations')
+            if type(locations) is not list:
+                continue
+            for loc in locations:
+                if type(loc) is not dict:
+                    continue
+                physical = loc.get('physicalLocation')
+                if type(physical) is not dict:
+                    continue
+                artifact = physical.get('artifactLocation')
+                if type(artifact) is not dict:
+                    continue
+                uri = artifact.get('uri')
+                if isinstance(uri, str) and uri.strip():
+                    location_files.add(uri)
+                    _add_keep(uri, keep_paths, keep_names)
+
+def _add_keep(value, keep_paths, keep_names):
+    """Record a path entry in both normalized keep sets"""
+    full_path, filename_only = normalize_path(value)
+    keep_paths.add(full_path)
+    if filename_only:
+        keep_names.add(filename_only)
+
+def _extract_streaming(f, include_filenames, include_file_fields):
+    """
+    Single streaming pass over the JSON file with ijson, collecting the
+    requested entry kinds without materialising the full object graph.
+    Normalized keep sets are built in the same pass so no second
+    iteration over the entries is needed.
+    """
+    location_files = set()
+    filename_files = set()
+    file_field_files = set()
+    keep_paths = set()
+    keep_names = set()
+
+    # Pending key/value pairs for objects we are currently inside,
+    # keyed by the object's prefix; cleared when the object closes
+    pending = {}
+
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if event == 'string':
+            obj_prefix, _, field = prefix.rpartition('.')
+            if field == 'uri':
+                # SARIF result locations live at one fixed pointer
+                if obj_prefix == _SARIF_URI_PREFIX and value.strip():
+                    location_files.add(value)
+                    _add_keep(value, keep_paths, keep_names)
+            elif field == 'file':
+                if include_file_fields and value.strip():
+                    file_field_files.add(value)
+                    _add_keep(value, keep_paths, keep_names)
+            elif field == 'key' or field == 'value':
+                entry = pending.setdefault(obj_prefix, {})
+                entry[field] = value
+                if 'key' in entry and 'value' in entry:
+                    if entry['value'].strip():
+                        if entry['key'] == 'location':
+                            location_files.add(entry['value'])
+                            _add_keep(entry['value'], keep_paths, keep_names)
+                        elif entry['key'] == 'filename' and include_filenames:
+                            filename_files.add(entry['value'])
+                            keep_names.add(entry['value'].strip())
+                    del pending[obj_prefix]
+        elif event == 'end_map':
+            # Drop any half-matched pair so pending stays O(depth)
+            pending.pop(prefix, None)
+
+    return location_files, filename_files, file_field_files, keep_paths, keep_names
+
+def extract_entries(json_file_path, include_filenames=False, include_file_fields=False):
+    """
+    Extract file paths referenced by the JSON document: key="location"
+    entries always, key="filename" and direct "file" fields when asked
+    for. Returns (location_files, filename_files, file_field_files,
+    keep_paths, keep_names); the last two are normalized lookup sets
+    built during the same pass.
+    """
+    empty = (set(), set(), set(), set(), set())
+
+    if ijson is not None:
+        # Stream the document instead of loading it all into memory
+        try:
+            # Map the file instead of reading it; pages stream in on
+            # demand and never live in the interpreter as one big blob
+            with open(json_file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _extract_streaming(mm, include_filenames, include_file_fields)
+        except (FileNotFoundError, ValueError, ijson.JSONError) as e:
+            print(f"Error reading JSON file: {e}")
+            return empty
+
+    try:
+        if orjson is not None:
+            # Rust-backed parse straight from the mapped pages; no
+            # intermediate bytes copy of the whole file
+            with open(json_file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = orjson.loads(memoryview(mm))
+        else:
+            with open(json_file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error reading JSON file: {e}")
+        return empty
+
+    location_files = set()
+    filename_files = set()
+    file_field_files = set()
+    keep_paths = set()
+    keep_names = set()
+
+    # SARIF keeps every result location at a known pointer; harvest those
+    # directly, matching on the pointer shape alone exactly as the
+    # streaming prefix match does (no top-level $schema/version gate, so
+    # both paths return identical sets), then fall through to the
+    # generic walk so key/value and "file" entries are still honored
+    _harvest_sarif_locations(data, location_files, keep_paths, keep_names)
+
+    # Iterative traversal with an explicit worklist: no per-node call
+    # overhead and no RecursionError on deeply nested documents
+    stack = deque([data])
+    while stack:
+        obj = stack.pop()
+        if type(obj) is dict:
+            key = obj.get("key")
+
+            # Check if this is a location entry (key-value pair)
+            if key == "location" and "value" in obj:
+                file_path = obj["value"]
+                if isinstance(file_path, str) and file_path.strip():
+                    location_files.add(file_path)
+                    _add_keep(file_path, keep_paths, keep_names)
+
+            # Check if this is a filename entry (key-value pair)
+            elif include_filenames and key == "filename" and "value" in obj:
+                file_name = obj["value"]
+                if isinstance(file_name, str) and file_name.strip():
+                    filename_files.add(file_name)
+                    keep_names.add(file_name.strip())
+
+            # Check if this object has a direct "file" field
+            if include_file_fields:
+                file_field = obj.get("file")
+                if isinstance(file_field, str) and file_field.strip():
+                    file_field_files.add(file_field)
+                    _add_keep(file_field, keep_paths, keep_names)
+
+            stack.extend(obj.values())
+        elif type(obj) is list:
+            stack.extend(obj)
+
+    return location_files, filename_files, file_field_files, keep_paths, keep_names
+
+# Cache of path -> final component, shared across calls
+_name_cache = {}
+
+# Directory names never worth walking into
+_DEFAULT_PRUNE_DIRS = frozenset({'.git'})
+
+def iter_files(root, prune_dirs=_DEFAULT_PRUNE_DIRS):
+    """
+    Recursively yield paths of all files under root using os.scandir,
+    pruning unwanted directories at entry so their contents are never
+    read, stat'ed, or allocated
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in prune_dirs:
+                    yield from iter_files(entry.path, prune_dirs)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry.path
+
+def find_files_to_delete(keep_paths, keep_names, protected_files):
+    """
+    Find all files in current directory that should be deleted; the keep
+    sets arrive pre-normalized from the extraction pass
+    """
+    # Prune protected directory-style entries at scandir time so their
+    # contents are never enumerated, then strip the leading './'
+    prune_dirs = _DEFAULT_PRUNE_DIRS | {prot_file for prot_file in protected_files
+                                        if '/' not in prot_file}
+    all_files = {path[2:] if path.startswith('./') else path
+                 for path in iter_files('.', prune_dirs)}
+
+    # Protected entries match by exact path or basename, like JSON
+    # entries. frozenset.union takes all the iterables at once, hashing
+    # each element a single time into one table.
+    keep_paths = frozenset(keep_paths).union(protected_files)
+    keep_names = frozenset(keep_names).union(
+        _name_cache.setdefault(prot_file, prot_file.rpartition('/')[2])
+        for prot_file in protected_files)
+
+    # Files to keep: everything matchable by full path or by name
+    files_to_keep = frozenset().union(keep_paths, keep_names)
+
+    # Express the match clauses as bulk set operations so the filtering
+    # runs as C-level hash work rather than a Python branch per file
+    delete_by_name = {file_path for file_path in all_files
+                      if file_path.rpartition('/')[2] not in keep_names}
+
+    # Directory-style protections as one prefix tuple; str.startswith
+    # tests every prefix in a single C call. The walk already prunes
+    # these directories, so this only guards paths fed in from elsewhere.
+    protected_prefixes = tuple(prot_file + '/' for prot_file in protected_files
+                               if '/' not in prot_file)
+    files_to_delete = [file_path for file_path in delete_by_name - keep_paths
+                       if not file_path.startswith(protected_prefixes)]
+
+    return files_to_delete, files_to_keep